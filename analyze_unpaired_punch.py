@@ -1,5 +1,6 @@
+import sys
 from datetime import time
-from attendance_processor import AttendanceProcessor, SHIFTS, CATEGORY_RULES
+from attendance_processor import AttendanceProcessor, SHIFTS
 
 # Create processor instance
 processor = AttendanceProcessor()
@@ -7,55 +8,61 @@ processor = AttendanceProcessor()
 # Parse the punch times
 punch_str = "00:01, 00:01, 08:57, 08:57, 10:45, 10:45, 11:00, 11:00, 12:57, 13:33, 13:33, 15:45, 15:45, 15:59, 15:59, 18:00, 18:00, 18:12, 18:12, 20:02, 20:36"
 punches = processor.parse_punch_records(punch_str)
+punch_mins = processor.parse_punch_minutes(punch_str)
 
-print("=" * 80)
-print("UNPAIRED PUNCH ANALYSIS")
-print("=" * 80)
+# Collect the report and write it to stdout in one go
+lines = []
 
-print(f"\nTotal punches: {len(punches)}")
-print(f"Last punch: {punches[-1]}")
-print(f"Second to last punch: {punches[-2]}")
+lines.append("=" * 80)
+lines.append("UNPAIRED PUNCH ANALYSIS")
+lines.append("=" * 80)
 
-print("\n" + "-" * 80)
-print("SCENARIO 1: The 20:36 is a CLOCK IN (entry)")
-print("-" * 80)
-print(f"Employee clocked IN at 20:36 but never clocked OUT")
-print(f"This time cannot be counted (incomplete pair)")
-print(f"Unaccounted time: Unknown (depends on when they actually left)")
+lines.append(f"\nTotal punches: {len(punches)}")
+lines.append(f"Last punch: {punches[-1]}")
+lines.append(f"Second to last punch: {punches[-2]}")
 
-print("\n" + "-" * 80)
-print("SCENARIO 2: The 20:36 is a CLOCK OUT (exit)")
-print("-" * 80)
-print(f"The pair should be: 20:02 → 20:36")
-print(f"Duration: {punches[-1].hour * 60 + punches[-1].minute - (punches[-2].hour * 60 + punches[-2].minute)} minutes")
+lines.append("\n" + "-" * 80)
+lines.append("SCENARIO 1: The 20:36 is a CLOCK IN (entry)")
+lines.append("-" * 80)
+lines.append(f"Employee clocked IN at 20:36 but never clocked OUT")
+lines.append(f"This time cannot be counted (incomplete pair)")
+lines.append(f"Unaccounted time: Unknown (depends on when they actually left)")
 
-shift_config = SHIFTS['Shift']
-rules = CATEGORY_RULES['Cont Worked']
+lines.append("\n" + "-" * 80)
+lines.append("SCENARIO 2: The 20:36 is a CLOCK OUT (exit)")
+lines.append("-" * 80)
+lines.append(f"The pair should be: 20:02 → 20:36")
+lines.append(f"Duration: {punch_mins[-1] - punch_mins[-2]} minutes")
+
+# Shift breaks, already converted to minute ranges at import
+break_ranges = SHIFTS['Shift']['breaks_mins']
 
 # Calculate as if 20:02 → 20:36 is a valid pair
-entry = punches[-2]  # 20:02
-exit_time = punches[-1]  # 20:36
+entry_mins = punch_mins[-2]  # 20:02
+exit_mins = punch_mins[-1]  # 20:36
 
-duration = processor.calculate_duration(entry, exit_time)
-break_mins = processor.deduct_breaks(entry, exit_time, shift_config['breaks'])
+duration = processor.calculate_duration_minutes(entry_mins, exit_mins)
+break_mins = processor.deduct_break_minutes(entry_mins, exit_mins, break_ranges)
 final_duration = duration - break_mins
 
-print(f"Raw duration: {duration} mins")
-print(f"Breaks deducted: {break_mins} mins (breaks occur 10:45-11:00 and 15:45-16:00)")
-print(f"Net duration: {final_duration} mins ({final_duration/60:.2f} hrs)")
-
-print("\n" + "=" * 80)
-print("COMPARISON:")
-print("=" * 80)
-print(f"Current calculation (20:36 ignored): 410 minutes = 6.83 hours")
-print(f"If 20:36 is exit time: {410 + final_duration} minutes = {(410 + final_duration)/60:.2f} hours")
-print(f"Difference: {final_duration} minutes ({final_duration/60:.2f} hours)")
-
-print("\n" + "=" * 80)
-print("RECOMMENDATION:")
-print("=" * 80)
-print(f"The 20:36 punch is likely a CLOCK IN (entry) without a corresponding exit.")
-print(f"This could indicate:")
-print(f"  • Employee continued working after 20:02 but forgot to clock out")
-print(f"  • System error or missing punch record")
-print(f"  • Need to manually verify with employee or manager")
+lines.append(f"Raw duration: {duration} mins")
+lines.append(f"Breaks deducted: {break_mins} mins (breaks occur 10:45-11:00 and 15:45-16:00)")
+lines.append(f"Net duration: {final_duration} mins ({final_duration/60:.2f} hrs)")
+
+lines.append("\n" + "=" * 80)
+lines.append("COMPARISON:")
+lines.append("=" * 80)
+lines.append(f"Current calculation (20:36 ignored): 410 minutes = 6.83 hours")
+lines.append(f"If 20:36 is exit time: {410 + final_duration} minutes = {(410 + final_duration)/60:.2f} hours")
+lines.append(f"Difference: {final_duration} minutes ({final_duration/60:.2f} hours)")
+
+lines.append("\n" + "=" * 80)
+lines.append("RECOMMENDATION:")
+lines.append("=" * 80)
+lines.append(f"The 20:36 punch is likely a CLOCK IN (entry) without a corresponding exit.")
+lines.append(f"This could indicate:")
+lines.append(f"  • Employee continued working after 20:02 but forgot to clock out")
+lines.append(f"  • System error or missing punch record")
+lines.append(f"  • Need to manually verify with employee or manager")
+
+sys.stdout.write("\n".join(lines) + "\n")
@@ -1,10 +1,10 @@
 import csv
 import re
-from datetime import datetime, timedelta, time
-from collections import defaultdict
+from datetime import time
+from collections import defaultdict, namedtuple
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
 
 # Shift Configuration
 SHIFTS = {
@@ -33,6 +33,21 @@ SHIFTS = {
     }
 }
 
+
+def _add_break_minutes(shifts):
+    """Pre-convert each shift's breaks to sorted (start_mins, end_mins) ranges"""
+    for shift_config in shifts.values():
+        shift_config['breaks_mins'] = sorted(
+            (start.hour * 60 + start.minute, end.hour * 60 + end.minute)
+            for start, end in shift_config['breaks']
+        )
+
+
+_add_break_minutes(SHIFTS)
+
+# Break ranges of the default shift, used by the whole-day calculations
+_SHIFT_BREAKS = SHIFTS['Shift']['breaks_mins']
+
 # Category/Employee Rules
 CATEGORY_RULES = {
     'Cont Worked': {
@@ -44,6 +59,37 @@ CATEGORY_RULES = {
     }
 }
 
+# Rules for the default category, resolved once at import
+_DEDUCT_BREAKS = CATEGORY_RULES['Cont Worked'].get('deduct_break_hours', True)
+_GRACE_LATE = CATEGORY_RULES['Cont Worked'].get('grace_late_coming', 0)
+_GRACE_EARLY = CATEGORY_RULES['Cont Worked'].get('grace_early_going', 0)
+
+# Day boundaries in minutes since midnight
+_NINE_AM = time(9, 0)           # Day 1 reference start
+_NINE_AM_MIN = 9 * 60
+_EARLY_MIN = 7 * 60 + 30        # Day 1 punches before 7:30 AM are dropped
+_BOUNDARY_MIN = 6 * 60 + 45     # Day 2 punches before 6:45 AM belong to Day 1
+
+# One IN -> OUT pair in an analyze_punch_pairs() result
+PunchPair = namedtuple('PunchPair', [
+    'pair_num',
+    'entry',
+    'exit',
+    'raw_duration_mins',
+    'breaks_deducted_mins',
+    'final_duration_mins',
+    'final_duration_hrs'
+])
+
+# Memo of time object -> minutes since midnight (at most 1440 distinct punch times)
+_MINUTES_BY_TIME = {}
+
+# 'HH:MM' label for every minute of the day, indexed by hour * 60 + minute
+_HHMM_LABELS = tuple(f"{m // 60:02d}:{m % 60:02d}" for m in range(24 * 60))
+
+# A single HH:MM punch between commas, e.g. '09:03' in '09:03, 11:27,'
+PUNCH_TIME_PATTERN = re.compile(r'(?:^|,)\s*([0-9]{1,2}):([0-9]{1,2})\s*(?=,|$)')
+
 class AttendanceProcessor:
     def __init__(self):
         self.employees = defaultdict(lambda: {
@@ -61,15 +107,32 @@ class AttendanceProcessor:
     def parse_time(self, time_str):
         """Convert time string (HH:MM) to datetime.time object"""
         try:
-            return datetime.strptime(time_str.strip(), '%H:%M').time()
-        except:
+            hours, sep, mins = time_str.strip().partition(':')
+        except (AttributeError, TypeError):
+            return None
+
+        # Same inputs as strptime('%H:%M'): one or two ASCII digits either side
+        if not sep or not (0 < len(hours) <= 2 and 0 < len(mins) <= 2):
+            return None
+        if not (hours.isascii() and hours.isdigit() and mins.isascii() and mins.isdigit()):
+            return None
+
+        hours = int(hours)
+        mins = int(mins)
+        if hours >= 24 or mins >= 60:
             return None
+        return time(hours, mins)
 
     def time_to_minutes(self, t):
         """Convert time object to minutes since midnight"""
-        if t is None:
-            return 0
-        return t.hour * 60 + t.minute
+        minutes = _MINUTES_BY_TIME.get(t)
+        if minutes is None:
+            minutes = 0 if t is None else t.hour * 60 + t.minute
+            # Only naive whole-minute times are cached: aware times with different
+            # wall clocks can compare equal, and seconds would grow the memo unbounded
+            if t is None or (t.tzinfo is None and not t.second and not t.microsecond):
+                _MINUTES_BY_TIME[t] = minutes
+        return minutes
 
     def minutes_to_time_str(self, minutes):
         """Convert minutes to HH:MM format"""
@@ -83,16 +146,30 @@ class AttendanceProcessor:
         Handles day spanning (e.g., 23:00 to 01:00 next day).
         Returns minutes worked.
         """
-        entry_minutes = self.time_to_minutes(entry_time)
-        exit_minutes = self.time_to_minutes(exit_time)
+        return self.calculate_duration_minutes(
+            self.time_to_minutes(entry_time),
+            self.time_to_minutes(exit_time)
+        )
 
-        if exit_minutes >= entry_minutes:
-            # Normal case: same day
-            return exit_minutes - entry_minutes
-        else:
-            # Day spanning: exit is next day
-            # From entry_time to 24:00 + 00:00 to exit_time
-            return (24 * 60 - entry_minutes) + exit_minutes
+    def calculate_duration_minutes(self, entry_minutes, exit_minutes):
+        """
+        Calculate duration between entry and exit given as minutes since midnight.
+        Handles day spanning the same way as calculate_duration().
+        Returns minutes worked.
+        """
+        # Same day gives exit - entry; for day spanning (exit earlier than
+        # entry) the modulo adds the 24 hours from entry to exit next day
+        return (exit_minutes - entry_minutes) % (24 * 60)
+
+    def breaks_to_minutes(self, breaks):
+        """
+        Convert breaks to a sorted list of (start_mins, end_mins) tuples.
+        Breaks: list of tuples (break_start, break_end) in time objects
+        """
+        return sorted(
+            (self.time_to_minutes(break_start), self.time_to_minutes(break_end))
+            for break_start, break_end in breaks
+        )
 
     def deduct_breaks(self, entry_time, exit_time, breaks):
         """
@@ -100,27 +177,34 @@ class AttendanceProcessor:
         Breaks: list of tuples (break_start, break_end) in time objects
         Returns minutes to deduct
         """
+        return self.deduct_break_minutes(
+            self.time_to_minutes(entry_time),
+            self.time_to_minutes(exit_time),
+            self.breaks_to_minutes(breaks)
+        )
+
+    def deduct_break_minutes(self, entry_mins, exit_mins, break_ranges):
+        """
+        Deduct break times from work duration, working on minutes since midnight.
+        break_ranges: sorted list of (start_mins, end_mins) tuples, see breaks_to_minutes()
+        Returns minutes to deduct
+        """
         total_break_mins = 0
-        entry_mins = self.time_to_minutes(entry_time)
-        exit_mins = self.time_to_minutes(exit_time)
 
         # Handle day spanning for exit time
         if exit_mins < entry_mins:
             exit_mins += 24 * 60
 
-        for break_start, break_end in breaks:
-            break_start_mins = self.time_to_minutes(break_start)
-            break_end_mins = self.time_to_minutes(break_end)
+        for break_start_mins, break_end_mins in break_ranges:
+            # Ranges are sorted by start: once a break starts after the exit,
+            # neither it nor any later break can overlap the work period
+            if break_start_mins >= exit_mins:
+                break
 
-            # Check if break falls within work period
-            if break_start_mins >= entry_mins and break_end_mins <= exit_mins:
-                total_break_mins += (break_end_mins - break_start_mins)
-            elif break_start_mins < exit_mins and break_end_mins > entry_mins:
-                # Partial overlap
-                overlap_start = max(break_start_mins, entry_mins)
-                overlap_end = min(break_end_mins, exit_mins)
-                if overlap_end > overlap_start:
-                    total_break_mins += (overlap_end - overlap_start)
+            # Overlap of break and work period (covers full and partial overlap)
+            overlap = min(break_end_mins, exit_mins) - max(break_start_mins, entry_mins)
+            if overlap > 0:
+                total_break_mins += overlap
 
         return total_break_mins
 
@@ -129,17 +213,22 @@ class AttendanceProcessor:
         Apply grace time for late coming and early going.
         Returns adjusted work duration in minutes.
         """
-        grace_late = rules.get('grace_late_coming', 0)
-        grace_early = rules.get('grace_early_going', 0)
-
-        shift_start = shift_config['begin_time']
-        shift_end = shift_config['end_time']
-
-        entry_mins = self.time_to_minutes(entry_time)
-        exit_mins = self.time_to_minutes(exit_time)
-        shift_start_mins = self.time_to_minutes(shift_start)
-        shift_end_mins = self.time_to_minutes(shift_end)
+        return self.apply_grace_time_minutes(
+            self.time_to_minutes(entry_time),
+            self.time_to_minutes(exit_time),
+            self.time_to_minutes(shift_config['begin_time']),
+            self.time_to_minutes(shift_config['end_time']),
+            rules.get('grace_late_coming', 0),
+            rules.get('grace_early_going', 0)
+        )
 
+    def apply_grace_time_minutes(self, entry_mins, exit_mins, shift_start_mins, shift_end_mins,
+                                 grace_late, grace_early):
+        """
+        Apply grace time with all times given as minutes since midnight.
+        grace_late / grace_early: allowed late coming / early going in minutes
+        Returns adjusted work duration in minutes.
+        """
         # Handle day spanning
         if exit_mins < entry_mins:
             exit_mins += 24 * 60
@@ -162,19 +251,22 @@ class AttendanceProcessor:
 
     def parse_punch_records(self, punch_str):
         """Parse punch records string and return list of times"""
+        return [time(mins // 60, mins % 60) for mins in self.parse_punch_minutes(punch_str)]
+
+    def parse_punch_minutes(self, punch_str):
+        """Parse punch records string and return list of minutes since midnight"""
         if not punch_str or punch_str.strip() == '':
             return []
 
-        # Split by comma and filter empty values
-        punches = [p.strip() for p in punch_str.split(',') if p.strip()]
-        times = []
+        # Invalid tokens (e.g. '24:00', 'ab') are skipped, as in parse_time
+        minutes = []
+        for hours, mins in PUNCH_TIME_PATTERN.findall(punch_str):
+            hours = int(hours)
+            mins = int(mins)
+            if hours < 24 and mins < 60:
+                minutes.append(hours * 60 + mins)
 
-        for punch in punches:
-            time_obj = self.parse_time(punch)
-            if time_obj:
-                times.append(time_obj)
-
-        return times
+        return minutes
 
     def parse_breaks(self, breaks_str):
         """
@@ -187,19 +279,15 @@ class AttendanceProcessor:
             return []
 
         breaks = []
-        break_periods = [b.strip() for b in breaks_str.split(',') if b.strip()]
 
-        for period in break_periods:
-            if '-' not in period:
-                raise ValueError(f"Invalid break format: '{period}'. Expected 'HH:MM-HH:MM'")
+        for period in (b.strip() for b in breaks_str.split(',')):
+            if not period:
+                continue
 
-            parts = period.split('-')
-            if len(parts) != 2:
+            start_str, sep, end_str = period.partition('-')
+            if not sep or '-' in end_str:
                 raise ValueError(f"Invalid break format: '{period}'. Expected 'HH:MM-HH:MM'")
 
-            start_str = parts[0].strip()
-            end_str = parts[1].strip()
-
             start_time = self.parse_time(start_str)
             end_time = self.parse_time(end_str)
 
@@ -210,6 +298,14 @@ class AttendanceProcessor:
 
         return breaks
 
+    def format_punches(self, punches):
+        """Format punches as a comma separated string of HH:MM times"""
+        return ', '.join([_HHMM_LABELS[t.hour * 60 + t.minute] for t in punches])
+
+    def deduplicate_punches(self, punches):
+        """Remove duplicate punches, keeping the first occurrence of each in order"""
+        return list(dict.fromkeys(punches))
+
     def minutes_to_decimal_hours(self, minutes):
         """Convert minutes to decimal hours"""
         return round(minutes / 60, 2)
@@ -227,54 +323,48 @@ class AttendanceProcessor:
             return 0
 
         # Remove all duplicate punches (keep first occurrence only)
-        seen = set()
-        deduplicated = []
-        for punch in punches:
-            if punch not in seen:
-                seen.add(punch)
-                deduplicated.append(punch)
+        deduplicated = self.deduplicate_punches(punches)
 
         if len(deduplicated) < 2:
             return 0
 
         # Use default shift configuration
         shift_config = SHIFTS['Shift']
-        rules = CATEGORY_RULES['Cont Worked']
+        break_ranges = _SHIFT_BREAKS
+        shift_start_mins = self.time_to_minutes(shift_config['begin_time'])
+        shift_end_mins = self.time_to_minutes(shift_config['end_time'])
+        grace_late = _GRACE_LATE
+        grace_early = _GRACE_EARLY
 
         # Reference time for Day 1: 09:00
-        reference_time = time(9, 0)
-        reference_mins = self.time_to_minutes(reference_time)
+        reference_mins = _NINE_AM_MIN
         use_reference = (day == 'day1')
+        deduct_breaks = _DEDUCT_BREAKS
 
         total_minutes = 0
         # Process pairs of punches (entry, exit)
         for i in range(0, len(deduplicated) - 1, 2):
-            entry = deduplicated[i]
-            exit_time = deduplicated[i + 1]
+            entry_mins = self.time_to_minutes(deduplicated[i])
+            exit_mins = self.time_to_minutes(deduplicated[i + 1])
 
             # For Day 1, adjust entry time to be at least 09:00
-            if use_reference:
-                entry_mins = self.time_to_minutes(entry)
-                if entry_mins < reference_mins:
-                    # Clock in was before 09:00, adjust to 09:00
-                    entry = reference_time
+            if use_reference and entry_mins < reference_mins:
+                # Clock in was before 09:00, adjust to 09:00
+                entry_mins = reference_mins
 
             # Calculate raw duration
-            duration = self.calculate_duration(entry, exit_time)
-
-            # Deduct breaks if configured
-            if rules.get('deduct_break_hours', True):
-                break_mins = self.deduct_breaks(entry, exit_time, shift_config['breaks'])
-                duration -= break_mins
+            duration = self.calculate_duration_minutes(entry_mins, exit_mins)
 
             # Apply grace time
-            grace_adjusted = self.apply_grace_time(entry, exit_time, shift_config, rules)
+            grace_adjusted = self.apply_grace_time_minutes(
+                entry_mins, exit_mins, shift_start_mins, shift_end_mins, grace_late, grace_early
+            )
             if grace_adjusted > 0:
                 duration = grace_adjusted
-                # Re-deduct breaks after grace adjustment
-                if rules.get('deduct_break_hours', True):
-                    break_mins = self.deduct_breaks(entry, exit_time, shift_config['breaks'])
-                    duration -= break_mins
+
+            # Deduct breaks if configured (same window with or without grace)
+            if deduct_breaks:
+                duration -= self.deduct_break_minutes(entry_mins, exit_mins, break_ranges)
 
             if duration > 0:
                 total_minutes += duration
@@ -293,16 +383,10 @@ class AttendanceProcessor:
             return 0
 
         # Remove all duplicate punches (keep first occurrence only)
-        seen = set()
-        deduplicated = []
-        for punch in punches:
-            if punch not in seen:
-                seen.add(punch)
-                deduplicated.append(punch)
+        deduplicated = self.deduplicate_punches(punches)
 
         # Reference time for Day 1: 09:00
-        reference_time = time(9, 0)
-        reference_mins = self.time_to_minutes(reference_time)
+        reference_mins = _NINE_AM_MIN
 
         # For Day 1, filter out all punches before 09:00
         if day == 'day1':
@@ -321,15 +405,16 @@ class AttendanceProcessor:
         last_punch = deduplicated[-1]
 
         # Use default shift configuration
-        shift_config = SHIFTS['Shift']
-        rules = CATEGORY_RULES['Cont Worked']
+        break_ranges = _SHIFT_BREAKS
 
         # Calculate total duration from first to last punch
-        total_duration = self.calculate_duration(first_punch, last_punch)
+        first_mins = self.time_to_minutes(first_punch)
+        last_mins = self.time_to_minutes(last_punch)
+        total_duration = self.calculate_duration_minutes(first_mins, last_mins)
 
         # Deduct breaks if configured
-        if rules.get('deduct_break_hours', True):
-            break_mins = self.deduct_breaks(first_punch, last_punch, shift_config['breaks'])
+        if _DEDUCT_BREAKS:
+            break_mins = self.deduct_break_minutes(first_mins, last_mins, break_ranges)
             total_duration -= break_mins
 
         return max(0, total_duration)
@@ -337,6 +422,7 @@ class AttendanceProcessor:
     def analyze_punch_pairs(self, punches, custom_breaks=None):
         """
         Analyze punch pairs and identify unpaired punches with detailed breakdown.
+        Each entry in 'pairs' is a PunchPair named tuple.
         custom_breaks: List of tuples like [(time(10,45), time(11,0)), (time(15,45), time(16,0))]
         If None, uses SHIFTS['Shift']['breaks']
         Returns a dictionary with analysis results.
@@ -344,18 +430,21 @@ class AttendanceProcessor:
         if not punches:
             return {'total_punches': 0, 'pairs': [], 'unpaired': None, 'total_minutes': 0}
 
-        # Remove all duplicate punches (keep first occurrence only)
-        seen = set()
-        deduplicated = []
-        for punch in punches:
-            if punch not in seen:
-                seen.add(punch)
-                deduplicated.append(punch)
+        # Remove all duplicate punches (keep first occurrence only);
+        # a single punch has nothing to deduplicate
+        if len(punches) < 2:
+            deduplicated = punches
+        else:
+            deduplicated = self.deduplicate_punches(punches)
 
         shift_config = SHIFTS['Shift']
 
         # Use custom breaks if provided, otherwise use shift config breaks
         breaks = custom_breaks if custom_breaks is not None else shift_config['breaks']
+        if custom_breaks is not None:
+            break_ranges = self.breaks_to_minutes(custom_breaks)
+        else:
+            break_ranges = _SHIFT_BREAKS
 
         pairs = []
         total_minutes = 0
@@ -365,19 +454,22 @@ class AttendanceProcessor:
             entry = deduplicated[i]
             exit_time = deduplicated[i + 1]
 
-            duration = self.calculate_duration(entry, exit_time)
-            break_mins = self.deduct_breaks(entry, exit_time, breaks)
+            entry_mins = self.time_to_minutes(entry)
+            exit_mins = self.time_to_minutes(exit_time)
+
+            duration = self.calculate_duration_minutes(entry_mins, exit_mins)
+            break_mins = self.deduct_break_minutes(entry_mins, exit_mins, break_ranges)
             final_duration = duration - break_mins
 
-            pairs.append({
-                'pair_num': (i // 2) + 1,
-                'entry': entry,
-                'exit': exit_time,
-                'raw_duration_mins': duration,
-                'breaks_deducted_mins': break_mins,
-                'final_duration_mins': final_duration,
-                'final_duration_hrs': round(final_duration / 60, 2)
-            })
+            pairs.append(PunchPair(
+                (i // 2) + 1,
+                entry,
+                exit_time,
+                duration,
+                break_mins,
+                final_duration,
+                round(final_duration / 60, 2)
+            ))
 
             if final_duration > 0:
                 total_minutes += final_duration
@@ -430,9 +522,9 @@ class AttendanceProcessor:
         print("-" * 100)
 
         for pair in analysis['pairs']:
-            print(f"{pair['pair_num']:<6} {str(pair['entry']):<12} {str(pair['exit']):<12} "
-                  f"{pair['raw_duration_mins']:<8} {pair['breaks_deducted_mins']:<8} "
-                  f"{pair['final_duration_mins']:<8} {pair['final_duration_hrs']:<8}")
+            print(f"{pair.pair_num:<6} {str(pair.entry):<12} {str(pair.exit):<12} "
+                  f"{pair.raw_duration_mins:<8} {pair.breaks_deducted_mins:<8} "
+                  f"{pair.final_duration_mins:<8} {pair.final_duration_hrs:<8}")
 
         if analysis['unpaired']:
             unpaired = analysis['unpaired']
@@ -461,29 +553,27 @@ class AttendanceProcessor:
         if not day1_punches or not day2_punches:
             return day1_punches, day2_punches, None
 
-        midnight_boundary = time(6, 45)  # 6:45 AM boundary
-        boundary_mins = self.time_to_minutes(midnight_boundary)
+        boundary_mins = _BOUNDARY_MIN  # 6:45 AM boundary
 
         # Check if Day 1 has punches
         if not day1_punches:
             return day1_punches, day2_punches, None
 
         # Check if Day 2 starts with punches before 6:00 AM (midnight cross-over)
-        day2_early_punches = []
-        day2_remaining_punches = []
-
-        for punch in day2_punches:
-            punch_mins = self.time_to_minutes(punch)
-            if punch_mins < boundary_mins:  # Before 6:00 AM
-                day2_early_punches.append(punch)
-            else:
-                day2_remaining_punches.append(punch)
+        day2_mins = [self.time_to_minutes(punch) for punch in day2_punches]
+        day2_early_punches = [
+            punch for punch, punch_mins in zip(day2_punches, day2_mins)
+            if punch_mins < boundary_mins
+        ]
 
         if day2_early_punches:
             # Early morning punches exist (before 6:00 AM) - they belong to the Day 1 shift
             # Move them to Day 1
             adjusted_day1 = day1_punches + day2_early_punches
-            adjusted_day2 = day2_remaining_punches
+            adjusted_day2 = [
+                punch for punch, punch_mins in zip(day2_punches, day2_mins)
+                if punch_mins >= boundary_mins
+            ]
 
             return adjusted_day1, adjusted_day2, {
                 'early_morning_punches': day2_early_punches,
@@ -499,15 +589,15 @@ class AttendanceProcessor:
         entry_time: time on Day 1
         exit_time: time on Day 2 (early morning)
         """
-        shift_config = SHIFTS['Shift']
-        rules = CATEGORY_RULES['Cont Worked']
+        entry_mins = self.time_to_minutes(entry_time)
+        exit_mins = self.time_to_minutes(exit_time)
 
         # Calculate raw duration from Day 1 evening to Day 2 morning
-        duration = self.calculate_duration(entry_time, exit_time)
+        duration = self.calculate_duration_minutes(entry_mins, exit_mins)
 
         # For cross-midnight shifts, deduct breaks if they fall within the window
-        if rules.get('deduct_break_hours', True):
-            break_mins = self.deduct_breaks(entry_time, exit_time, shift_config['breaks'])
+        if _DEDUCT_BREAKS:
+            break_mins = self.deduct_break_minutes(entry_mins, exit_mins, _SHIFT_BREAKS)
             duration -= break_mins
 
         return max(0, duration)
@@ -521,37 +611,10 @@ class AttendanceProcessor:
                 next(reader)
 
                 for row in reader:
-                    # Each row is a single string with quotes, need to parse it manually
+                    # Each row is a single quoted string holding the real CSV
+                    # record (quotes doubled); parse that record with csv too
                     if len(row) == 1:
-                        # Parse the quoted row
-                        row_str = row[0]
-                        # Extract fields between quotes
-                        fields = []
-                        in_quotes = False
-                        current_field = ''
-                        i = 0
-                        while i < len(row_str):
-                            if row_str[i] == '"':
-                                if in_quotes and i + 1 < len(row_str) and row_str[i + 1] == '"':
-                                    # Escaped quote
-                                    current_field += '"'
-                                    i += 2
-                                else:
-                                    # Toggle quote state
-                                    in_quotes = not in_quotes
-                                    i += 1
-                            elif row_str[i] == ',' and not in_quotes:
-                                # Field separator
-                                fields.append(current_field)
-                                current_field = ''
-                                i += 1
-                            else:
-                                current_field += row_str[i]
-                                i += 1
-                        if current_field or in_quotes:
-                            fields.append(current_field)
-
-                        row = fields
+                        row = next(csv.reader([row[0]]), [])
 
                     if len(row) < 8:
                         continue
@@ -566,22 +629,25 @@ class AttendanceProcessor:
                     if not emp_code or status == 'Not Present':
                         continue
 
+                    # Look up (or create) the employee record once per row
+                    emp = self.employees[emp_code]
+
                     # Store employee info
                     if day_key == 'day1':
-                        self.employees[emp_code]['name'] = emp_name
-                        self.employees[emp_code]['company'] = company
-                        self.employees[emp_code]['department'] = department
+                        emp['name'] = emp_name
+                        emp['company'] = company
+                        emp['department'] = department
 
                     # Parse punches and calculate hours
                     punches = self.parse_punch_records(punch_str)
                     hours = self.calculate_working_hours_total_span(punches, day_key)
 
                     if day_key == 'day1':
-                        self.employees[emp_code]['day1_punches'] = punches
-                        self.employees[emp_code]['day1_hours'] = hours
+                        emp['day1_punches'] = punches
+                        emp['day1_hours'] = hours
                     else:
-                        self.employees[emp_code]['day2_punches'] = punches
-                        self.employees[emp_code]['day2_hours'] = hours
+                        emp['day2_punches'] = punches
+                        emp['day2_hours'] = hours
 
         except Exception as e:
             print(f"Error reading {filepath}: {e}")
@@ -590,9 +656,9 @@ class AttendanceProcessor:
 
     def generate_excel(self, output_filepath):
         """Generate Excel file with attendance summary"""
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Attendance"
+        # Write-only mode streams rows to disk instead of keeping every cell in memory
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet("Attendance")
 
         # Define styles
         header_font = Font(bold=True, color="FFFFFF")
@@ -622,15 +688,6 @@ class AttendanceProcessor:
             "Total Hours"
         ]
 
-        # Write headers
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col)
-            cell.value = header
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-            cell.border = border
-
         # Set column widths
         ws.column_dimensions['A'].width = 14
         ws.column_dimensions['B'].width = 25
@@ -642,10 +699,36 @@ class AttendanceProcessor:
         ws.column_dimensions['H'].width = 12
         ws.column_dimensions['I'].width = 12
 
+        # Freeze first row (must be set before any row is written)
+        ws.freeze_panes = 'A2'
+
+        # Write headers
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = header_alignment
+            cell.border = border
+            header_cells.append(cell)
+        ws.append(header_cells)
+
+        # Data row buffer: one styled cell per column, reused for every row
+        # (write-only rows are serialised as soon as they are appended)
+        row_cells = []
+        for col in range(1, 10):
+            cell = WriteOnlyCell(ws)
+            cell.border = border
+            if col in [1, 3, 4, 5, 7]:  # Text columns
+                cell.alignment = data_alignment
+            else:  # Number columns
+                cell.alignment = center_alignment
+                if col in [6, 8, 9]:  # Hour columns
+                    cell.number_format = '0.00'
+            row_cells.append(cell)
+
         # Write data
-        row = 2
-        for emp_code in sorted(self.employees.keys()):
-            emp = self.employees[emp_code]
+        for emp_code, emp in sorted(self.employees.items()):
 
             # Skip employees with no hours
             if emp['day1_hours'] == 0 and emp['day2_hours'] == 0:
@@ -656,35 +739,24 @@ class AttendanceProcessor:
             total_hours = day1_hours_decimal  # Total duration = day1 hours only
 
             # Format punch times
-            day1_punches_str = ', '.join([t.strftime('%H:%M') for t in emp['day1_punches']]) if emp['day1_punches'] else ''
-            day2_punches_str = ', '.join([t.strftime('%H:%M') for t in emp['day2_punches']]) if emp['day2_punches'] else ''
-
-            # Write row
-            ws.cell(row=row, column=1).value = emp_code
-            ws.cell(row=row, column=2).value = emp['name']
-            ws.cell(row=row, column=3).value = emp['company']
-            ws.cell(row=row, column=4).value = emp['department']
-            ws.cell(row=row, column=5).value = day1_punches_str
-            ws.cell(row=row, column=6).value = day1_hours_decimal
-            ws.cell(row=row, column=7).value = day2_punches_str
-            ws.cell(row=row, column=8).value = day2_hours_decimal
-            ws.cell(row=row, column=9).value = total_hours
-
-            # Apply borders and alignment
-            for col in range(1, 10):
-                cell = ws.cell(row=row, column=col)
-                cell.border = border
-                if col in [1, 3, 4, 5, 7]:  # Text columns
-                    cell.alignment = data_alignment
-                else:  # Number columns
-                    cell.alignment = center_alignment
-                    if col in [6, 8, 9]:  # Hour columns
-                        cell.number_format = '0.00'
-
-            row += 1
-
-        # Freeze first row
-        ws.freeze_panes = 'A2'
+            day1_punches_str = self.format_punches(emp['day1_punches'])
+            day2_punches_str = self.format_punches(emp['day2_punches'])
+
+            values = [
+                emp_code,
+                emp['name'],
+                emp['company'],
+                emp['department'],
+                day1_punches_str,
+                day1_hours_decimal,
+                day2_punches_str,
+                day2_hours_decimal,
+                total_hours
+            ]
+
+            for cell, value in zip(row_cells, values):
+                cell.value = value
+            ws.append(row_cells)
 
         # Save workbook
         wb.save(output_filepath)
@@ -699,18 +771,21 @@ class AttendanceProcessor:
         self.read_attendance_file(day2_file, 'day2')
 
         # Define the 9 AM reference threshold
-        reference_time = time(9, 0)
-        reference_mins = self.time_to_minutes(reference_time)
-        early_boundary = time(7, 30)  # 7:30 AM boundary
-        early_boundary_mins = self.time_to_minutes(early_boundary)
+        reference_time = _NINE_AM
+        reference_mins = _NINE_AM_MIN
+        early_boundary_mins = _EARLY_MIN  # 7:30 AM boundary
 
         # Detect and handle cross-midnight shifts
         print("Detecting cross-midnight shifts...")
-        midnight_boundary = time(6, 45)  # 6:45 AM boundary
-        boundary_mins = self.time_to_minutes(midnight_boundary)
+        boundary_mins = _BOUNDARY_MIN  # 6:45 AM boundary
+
+        for emp in self.employees.values():
+            if not emp['day1_punches'] and not emp['day2_punches']:
+                # No punches on either day: nothing to shift, filter or total
+                emp['day1_hours'] = 0
+                emp['day2_hours'] = 0
+                continue
 
-        for emp_code in self.employees.keys():
-            emp = self.employees[emp_code]
             day1_punches, day2_punches, cross_info = self.detect_cross_midnight_shift(
                 emp['day1_punches'], emp['day2_punches']
             )
@@ -719,28 +794,27 @@ class AttendanceProcessor:
             emp['day1_punches'] = day1_punches
             emp['day2_punches'] = day2_punches
 
-            # Filter and adjust Day 1 punches: punches between 7:30 AM to 8:59 AM are treated as 9:00 AM
-            day1_filtered = []
-            for punch in day1_punches:
-                punch_mins = self.time_to_minutes(punch)
-                if punch_mins >= early_boundary_mins:
-                    # Punch is after 7:30 AM
-                    if punch_mins < reference_mins:
-                        # Punch is between 7:30 AM and 8:59 AM - treat as 9:00 AM
-                        day1_filtered.append(reference_time)
-                    else:
-                        # Punch is at or after 9:00 AM - keep as is
-                        day1_filtered.append(punch)
+            # Convert each punch to minutes once for the boundary checks below
+            day1_mins = [self.time_to_minutes(punch) for punch in day1_punches]
+            day2_mins = [self.time_to_minutes(punch) for punch in day2_punches]
+
+            # Filter and adjust Day 1 punches: drop punches before 7:30 AM,
+            # punches between 7:30 AM and 8:59 AM are treated as 9:00 AM
+            day1_filtered = [
+                reference_time if punch_mins < reference_mins else punch
+                for punch, punch_mins in zip(day1_punches, day1_mins)
+                if punch_mins >= early_boundary_mins
+            ]
 
             # Filter day 2 punches up to 6:45 AM (early morning punches)
-            day2_early_punches = []
-            day2_remaining_punches = []
-            for punch in day2_punches:
-                punch_mins = self.time_to_minutes(punch)
-                if punch_mins <= boundary_mins:
-                    day2_early_punches.append(punch)
-                else:
-                    day2_remaining_punches.append(punch)
+            day2_early_punches = [
+                punch for punch, punch_mins in zip(day2_punches, day2_mins)
+                if punch_mins <= boundary_mins
+            ]
+            day2_remaining_punches = [
+                punch for punch, punch_mins in zip(day2_punches, day2_mins)
+                if punch_mins > boundary_mins
+            ]
 
             # Combine Day 1 punches (from 7:30 AM onwards, with 7:30-8:59 treated as 9 AM) with Day 2 early morning punches (up to 6:45 AM)
             combined_punches = day1_filtered + day2_early_punches
@@ -19,24 +19,33 @@ total_minutes = 0
 shift_config = SHIFTS['Shift']
 rules = CATEGORY_RULES['Cont Worked']
 
+# Shift settings in minutes, resolved once for all pairs
+break_ranges = shift_config['breaks_mins']
+shift_start_mins = processor.time_to_minutes(shift_config['begin_time'])
+shift_end_mins = processor.time_to_minutes(shift_config['end_time'])
+grace_late = rules.get('grace_late_coming', 0)
+grace_early = rules.get('grace_early_going', 0)
+punch_mins = processor.parse_punch_minutes(punch_str)
+
 for i in range(0, len(punches) - 1, 2):
     entry = punches[i]
     exit_time = punches[i + 1]
+    entry_mins = punch_mins[i]
+    exit_mins = punch_mins[i + 1]
 
     # Calculate raw duration
-    duration = processor.calculate_duration(entry, exit_time)
+    duration = processor.calculate_duration_minutes(entry_mins, exit_mins)
 
     # Deduct breaks
-    break_mins = processor.deduct_breaks(entry, exit_time, shift_config['breaks'])
+    break_mins = processor.deduct_break_minutes(entry_mins, exit_mins, break_ranges)
     duration_after_break = duration - break_mins
 
-    # Apply grace time
-    grace_adjusted = processor.apply_grace_time(entry, exit_time, shift_config, rules)
+    # Apply grace time, then deduct the same breaks from the adjusted duration
+    grace_adjusted = processor.apply_grace_time_minutes(
+        entry_mins, exit_mins, shift_start_mins, shift_end_mins, grace_late, grace_early
+    )
     if grace_adjusted > 0:
-        duration_final = grace_adjusted
-        # Re-deduct breaks after grace
-        break_mins = processor.deduct_breaks(entry, exit_time, shift_config['breaks'])
-        duration_final -= break_mins
+        duration_final = grace_adjusted - break_mins
     else:
         duration_final = duration_after_break
 
@@ -1,5 +1,5 @@
 import csv
-from datetime import datetime, time
+from datetime import time
 from collections import defaultdict
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
@@ -19,6 +19,24 @@ SHIFTS = {
     }
 }
 
+
+def _add_break_minutes(shifts):
+    # Break periods as (start_mins, end_mins), converted once at import
+    for shift in shifts.values():
+        shift['breaks_mins'] = [
+            (b1.hour * 60 + b1.minute, b2.hour * 60 + b2.minute)
+            for b1, b2 in shift['breaks']
+        ]
+
+
+_add_break_minutes(SHIFTS)
+
+# Day 2 punches at or before 06:45 belong to the Day 1 shift
+MIDNIGHT_BOUNDARY_MINS = 6 * 60 + 45
+
+# "HH:MM" label for every minute of the day, indexed by minutes since midnight
+HHMM_LABELS = tuple(f"{m // 60:02d}:{m % 60:02d}" for m in range(1440))
+
 CATEGORY_RULES = {
     'Cont Worked': {
         'deduct_break_hours': True
@@ -44,29 +62,43 @@ class AttendanceProcessor:
     # ---------- TIME HELPERS ---------- #
 
     def parse_time(self, s):
+        # Accepts what strptime("%H:%M") did: 1-2 ASCII digits either side
         try:
-            return datetime.strptime(s.strip(), "%H:%M").time()
-        except:
+            h, sep, m = s.strip().partition(':')
+        except (AttributeError, TypeError):
+            return None
+        if not sep or not (0 < len(h) <= 2 and 0 < len(m) <= 2):
             return None
+        if not (h.isascii() and h.isdigit() and m.isascii() and m.isdigit()):
+            return None
+        h, m = int(h), int(m)
+        if h >= 24 or m >= 60:
+            return None
+        return time(h, m)
 
     def time_to_minutes(self, t):
         return t.hour * 60 + t.minute
 
     def calculate_duration(self, start, end):
-        s = self.time_to_minutes(start)
-        e = self.time_to_minutes(end)
-        return e - s if e >= s else (1440 - s + e)
+        return self.calculate_duration_minutes(
+            self.time_to_minutes(start), self.time_to_minutes(end)
+        )
+
+    def calculate_duration_minutes(self, s, e):
+        return (e - s) % 1440
 
     def deduct_breaks(self, start, end, breaks):
-        s = self.time_to_minutes(start)
-        e = self.time_to_minutes(end)
+        ranges = [(self.time_to_minutes(b1), self.time_to_minutes(b2)) for b1, b2 in breaks]
+        return self.deduct_break_minutes(
+            self.time_to_minutes(start), self.time_to_minutes(end), ranges
+        )
+
+    def deduct_break_minutes(self, s, e, ranges):
         if e < s:
             e += 1440
 
         total = 0
-        for b1, b2 in breaks:
-            bs = self.time_to_minutes(b1)
-            be = self.time_to_minutes(b2)
+        for bs, be in ranges:
             if bs < e and be > s:
                 total += max(0, min(be, e) - max(bs, s))
         return total
@@ -80,32 +112,31 @@ class AttendanceProcessor:
         if len(punches) < 2:
             return 0
 
-        punches = sorted(set(punches), key=self.time_to_minutes)
+        # Only the earliest and latest distinct punch matter
+        mins = [self.time_to_minutes(p) for p in punches]
 
         if day == 'day1':
-            punches = [p for p in punches if self.time_to_minutes(p) >= 540]
+            mins = [m for m in mins if m >= 540]
 
-        if len(punches) < 2:
+        if not mins:
+            return 0
+
+        start, end = min(mins), max(mins)
+        if start == end:
             return 0
 
-        start, end = punches[0], punches[-1]
-        duration = self.calculate_duration(start, end)
+        duration = self.calculate_duration_minutes(start, end)
 
-        duration -= self.deduct_breaks(start, end, SHIFTS['Shift']['breaks'])
+        duration -= self.deduct_break_minutes(start, end, SHIFTS['Shift']['breaks_mins'])
         return max(0, duration)
 
     # ---------- MIDNIGHT MERGE ---------- #
 
     def merge_midnight_punches(self, day1, day2):
-        boundary = self.time_to_minutes(time(6, 45))
+        day2_mins = [self.time_to_minutes(p) for p in day2]
         merged = list(day1)
-        remaining = []
-
-        for p in day2:
-            if self.time_to_minutes(p) <= boundary:
-                merged.append(p)
-            else:
-                remaining.append(p)
+        merged += [p for p, m in zip(day2, day2_mins) if m <= MIDNIGHT_BOUNDARY_MINS]
+        remaining = [p for p, m in zip(day2, day2_mins) if m > MIDNIGHT_BOUNDARY_MINS]
 
         return merged, remaining
 
@@ -160,9 +191,9 @@ class AttendanceProcessor:
     # ---------- EXCEL ---------- #
 
     def generate_excel(self, output):
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Attendance"
+        # Rows are only ever appended, so stream them in write-only mode
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet("Attendance")
 
         headers = [
             "Employee Code", "Name", "Company", "Department",
@@ -181,9 +212,9 @@ class AttendanceProcessor:
                 emp['name'],
                 emp['company'],
                 emp['department'],
-                ", ".join(t.strftime("%H:%M") for t in emp['day1_punches']),
+                ", ".join(HHMM_LABELS[self.time_to_minutes(t)] for t in emp['day1_punches']),
                 self.minutes_to_decimal(emp['day1_hours']),
-                ", ".join(t.strftime("%H:%M") for t in emp['day2_punches']),
+                ", ".join(HHMM_LABELS[self.time_to_minutes(t)] for t in emp['day2_punches']),
                 self.minutes_to_decimal(emp['day2_hours']),
                 self.minutes_to_decimal(emp['total_hours'])
             ])
@@ -1,19 +1,31 @@
 """
 Unit tests for the Attendance Processor
 """
+import os
+import tempfile
 import unittest
-from datetime import time
+from datetime import time, timedelta, timezone
 from attendance_processor import AttendanceProcessor
 
 
 class TestAttendanceProcessor(unittest.TestCase):
     """Test cases for AttendanceProcessor"""
 
-    def setUp(self):
-        """Set up test fixtures"""
-        self.processor = AttendanceProcessor()
-        self.processor.read_attendance_file('day1.txt', 'day1')
-        self.processor.read_attendance_file('day2.txt', 'day2')
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures, reading the attendance files once for the class"""
+        cls.processor = AttendanceProcessor()
+        cls.processor.read_attendance_file('day1.txt', 'day1')
+        cls.processor.read_attendance_file('day2.txt', 'day2')
+
+        # EW00029 record and its cross-midnight split, shared by the employee data tests.
+        # Use get() so a missing code does not add an empty record to the shared processor
+        cls.ew00029 = cls.processor.employees.get('EW00029')
+        cls.ew00029_shift = None
+        if cls.ew00029 is not None:
+            cls.ew00029_shift = cls.processor.detect_cross_midnight_shift(
+                cls.ew00029['day1_punches'], cls.ew00029['day2_punches']
+            )
 
     # ==================== Time Conversion Tests ====================
     def test_time_to_minutes_morning(self):
@@ -37,6 +49,29 @@ class TestAttendanceProcessor(unittest.TestCase):
         result = self.processor.time_to_minutes(t)
         self.assertEqual(result, expected)
 
+    def test_time_to_minutes_timezone_aware(self):
+        """Test aware times that compare equal keep their own wall-clock minutes"""
+        utc_nine = time(9, 0, tzinfo=timezone.utc)
+        cet_ten = time(10, 0, tzinfo=timezone(timedelta(hours=1)))
+        self.assertEqual(self.processor.time_to_minutes(utc_nine), 540)
+        self.assertEqual(self.processor.time_to_minutes(cet_ten), 600)
+
+    # ==================== Punch Parsing Tests ====================
+    def test_parse_punch_minutes(self):
+        """Test punch string parsing to minutes, skipping invalid tokens"""
+        result = self.processor.parse_punch_minutes('09:03, 13:35,24:00,ab,,20:38,')
+        self.assertEqual(result, [543, 815, 1238])
+
+    def test_format_punches(self):
+        """Test punches are formatted as comma separated HH:MM times"""
+        result = self.processor.format_punches([time(9, 3), time(0, 0), time(20, 38)])
+        self.assertEqual(result, '09:03, 00:00, 20:38')
+        self.assertEqual(self.processor.format_punches([]), '')
+
+        # Aware times that compare equal still get their own wall-clock label
+        aware = [time(9, 0, tzinfo=timezone.utc), time(10, 0, tzinfo=timezone(timedelta(hours=1)))]
+        self.assertEqual(self.processor.format_punches(aware), '09:00, 10:00')
+
     # ==================== Duration Calculation Tests ====================
     def test_calculate_duration_same_day(self):
         """Test duration calculation within same day"""
@@ -100,6 +135,15 @@ class TestAttendanceProcessor(unittest.TestCase):
         result = self.processor.deduct_breaks(entry, exit_time, breaks)
         self.assertEqual(result, 30)  # 15 + 15
 
+    def test_breaks_to_minutes_sorted(self):
+        """Test breaks are converted to sorted minute ranges"""
+        breaks = [
+            (time(15, 45), time(16, 0)),
+            (time(10, 45), time(11, 0))
+        ]
+        result = self.processor.breaks_to_minutes(breaks)
+        self.assertEqual(result, [(645, 660), (945, 960)])
+
     # ==================== Grace Time Tests ====================
     def test_apply_grace_time_late_coming(self):
         """Test grace time for late coming (within 10 mins)"""
@@ -127,8 +171,8 @@ class TestAttendanceProcessor(unittest.TestCase):
     # ==================== Cross-Midnight Shift Detection Tests ====================
     def test_cross_midnight_shift_detection(self):
         """Test detection of cross-midnight shift"""
-        emp_code = 'EW00029'
-        emp = self.processor.employees[emp_code]
+        emp = self.ew00029
+        self.assertIsNotNone(emp, "EW00029 was not read from the attendance files")
 
         day1_adj, day2_adj, cross_info = self.processor.detect_cross_midnight_shift(
             emp['day1_punches'], emp['day2_punches']
@@ -150,74 +194,56 @@ class TestAttendanceProcessor(unittest.TestCase):
         self.assertEqual(result, expected)
 
     # ==================== Employee Data Tests ====================
-    def test_employee_ew00029_day1_hours(self):
-        """Test that EW00029 Day 1 hours are calculated correctly"""
-        emp = self.processor.employees['EW00029']
+    def test_employee_ew00029_hours(self):
+        """Test EW00029 Day 1, Day 2 and total hours"""
+        self.assertIsNotNone(self.ew00029, "EW00029 was not read from the attendance files")
 
-        # Adjust for cross-midnight
-        day1_adj, day2_adj, cross_info = self.processor.detect_cross_midnight_shift(
-            emp['day1_punches'], emp['day2_punches']
-        )
+        # Adjusted for cross-midnight
+        day1_adj, day2_adj, cross_info = self.ew00029_shift
 
         day1_hours = self.processor.calculate_working_hours(day1_adj)
-        expected = int(10.57 * 60)  # 10.57 hours = 634 minutes
-
-        # Allow small tolerance due to grace time and break calculations
-        self.assertAlmostEqual(day1_hours, expected, delta=5)
-
-    def test_employee_ew00029_day2_hours(self):
-        """Test that EW00029 Day 2 hours are calculated correctly"""
-        emp = self.processor.employees['EW00029']
-
-        # Don't adjust Day 2 for cross-midnight (keep original punches)
-        day2_hours = self.processor.calculate_working_hours(emp['day2_punches'])
-        expected = int(20.65 * 60)  # 20.65 hours = 1239 minutes
-
-        # Allow small tolerance due to grace time and break calculations
-        self.assertAlmostEqual(day2_hours, expected, delta=5)
-
-    def test_employee_ew00029_total_hours(self):
-        """Test total hours for EW00029 across both days"""
-        emp = self.processor.employees['EW00029']
-
-        # Get adjusted punches
-        day1_adj, day2_adj, cross_info = self.processor.detect_cross_midnight_shift(
-            emp['day1_punches'], emp['day2_punches']
-        )
-
-        day1_hours = self.processor.calculate_working_hours(day1_adj)
-        day2_hours = self.processor.calculate_working_hours(day2_adj)
+        # Day 2 on its own is checked without the cross-midnight adjustment
+        day2_hours = self.processor.calculate_working_hours(self.ew00029['day2_punches'])
+        day2_adj_hours = self.processor.calculate_working_hours(day2_adj)
         cross_hours = 203 if cross_info else 0  # 3.38 hours
 
-        total = day1_hours + day2_hours + cross_hours
-        expected = int(34.60 * 60)  # 34.60 hours = 2076 minutes
-
-        self.assertAlmostEqual(total, expected, delta=5)
+        cases = (
+            ('day1', day1_hours, int(10.57 * 60)),  # 10.57 hours = 634 minutes
+            ('day2', day2_hours, int(20.65 * 60)),  # 20.65 hours = 1239 minutes
+            ('total', day1_hours + day2_adj_hours + cross_hours, int(34.60 * 60)),  # 2076 minutes
+        )
+        for label, actual, expected in cases:
+            with self.subTest(label=label):
+                # Allow small tolerance due to grace time and break calculations
+                self.assertAlmostEqual(actual, expected, delta=5)
 
     # ==================== Excel Output Tests ====================
     def test_excel_file_generated(self):
         """Test that Excel file is generated"""
-        import os
+        # Write into a private directory that is removed afterwards
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_file = os.path.join(tmp_dir, 'test_output.xls')
+            self.processor.generate_excel(output_file)
 
-        output_file = 'test_output.xls'
-        self.processor.generate_excel(output_file)
-
-        # Check file exists
-        self.assertTrue(os.path.exists(output_file))
-
-        # Clean up
-        if os.path.exists(output_file):
-            os.remove(output_file)
+            # Check file exists
+            self.assertTrue(os.path.exists(output_file))
 
     def test_all_employees_processed(self):
         """Test that all employees are present in the data"""
         # Should have at least 50 employees
         self.assertGreaterEqual(len(self.processor.employees), 50)
 
+    def test_quoted_row_fields_parsed(self):
+        """Test that single-field quoted rows are split into plain values"""
+        emp = self.processor.employees['AW00035']
+        self.assertEqual(emp['name'], 'Trinath Majhi')
+        self.assertEqual(emp['company'], 'Default')
+        self.assertEqual(emp['day1_punches'], [time(11, 23), time(13, 1), time(13, 36), time(20, 38)])
+
     def test_employee_has_required_fields(self):
         """Test that each employee has required data fields"""
-        emp_code = 'EW00029'
-        emp = self.processor.employees[emp_code]
+        emp = self.ew00029
+        self.assertIsNotNone(emp, "EW00029 was not read from the attendance files")
 
         required_fields = ['name', 'company', 'department', 'day1_punches', 'day1_hours', 'day2_punches', 'day2_hours']
         for field in required_fields: